@@ -1,15 +1,74 @@
 import chess
-from stockfish import Stockfish
 import os 
+import threading
 import time 
-from engine.algorithm import alphabeta  # <-- import your engine
+from engine.algorithm import alphabeta, mate_in  # <-- import your engine
+from rich.color import ColorSystem
 from rich.console import Console
 from rich.style import Style
+from rich.text import Text
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 console = Console()
 
+# Start-up budget: from launching main.py to the first move prompt. This
+# includes the first recommendation search (goal: <1s) and waiting for the
+# background Stockfish (booted and searching alongside it), on top of
+# imports and the first board.
+STARTUP_TARGET = 1.5
+
+
+class BackgroundStockfish:
+    """
+    Starts the reference Stockfish process on a background thread so the
+    first board can be drawn while the engine boots. recommend() runs its
+    search on another thread, alongside the custom engine's search, and
+    best_move() collects it. get() waits for the engine and returns None
+    (with the error kept in .error) if it could not be started.
+    """
+
+    def __init__(self, path, **kwargs):
+        self.engine = None
+        self.error = None
+        self.move = None
+        self._search = None
+        self._thread = threading.Thread(target=self._start, args=(path,), kwargs=kwargs, daemon=True)
+        self._thread.start()
+
+    def _start(self, path, **kwargs):
+        try:
+            # Deferred: importing the wrapper is only needed once the engine runs
+            from stockfish import Stockfish
+            self.engine = Stockfish(path=path, **kwargs)
+        except Exception as e:
+            self.error = e
+
+    def get(self):
+        self._thread.join()
+        return self.engine
+
+    def recommend(self, fen):
+        """ Starts a best-move search for the position on a background thread """
+        self._search = threading.Thread(target=self._best_move, args=(fen,), daemon=True)
+        self._search.start()
+
+    def _best_move(self, fen):
+        self.move = None
+        engine = self.get()
+        if engine is None:
+            return
+        try:
+            engine.set_fen_position(fen)
+            self.move = engine.get_best_move()
+        except Exception as e:
+            self.error = e
+
+    def best_move(self):
+        """ Waits for the search started by recommend(); None if Stockfish failed """
+        self._search.join()
+        return self.move if self.error is None else None
+
 # --- Square colors ---
 LIGHT_SQUARE = "#EEEED2"
 DARK_SQUARE  = "#A6BE8D"
@@ -42,99 +101,244 @@ def piece_color(piece):
     else:
         return "#FF0000"  # red for black pieces
 
-def print_rich_board(board, square_width=7, square_height=3):
-    rows = str(board).split("\n")
-    files = "a b c d e f g h".split()
+# Styled square lines, built once per (symbol, shade, size) and reused every frame
+_SQUARE_CACHE = {}
+_ANSI_CACHE = {}
 
-    # --- Top file coordinates ---
-    coord_line = "  " + "".join(f.center(square_width) for f in files)
-    console.print(coord_line)
+_COLOR_SYSTEMS = {
+    "standard": ColorSystem.STANDARD,
+    "256": ColorSystem.EIGHT_BIT,
+    "truecolor": ColorSystem.TRUECOLOR,
+    "windows": ColorSystem.WINDOWS,
+}
+
+def styled_square(sq, is_dark, square_width=7, square_height=3):
+    """ Cached (style, lines) for one square; sq is a board symbol or "." """
+    key = (sq, is_dark, square_width, square_height)
+    cached = _SQUARE_CACHE.get(key)
+    if cached is None:
+        bg = DARK_SQUARE if is_dark else LIGHT_SQUARE
+        style = Style(bgcolor=bg, color=piece_color(sq), bold=True)
+        blank = " " * square_width
+        lines = tuple(
+            UNICODE_PIECES[sq].center(square_width) if h == square_height // 2 else blank
+            for h in range(square_height)
+        )
+        cached = _SQUARE_CACHE[key] = (style, lines)
+    return cached
 
-    for r_idx, row in enumerate(rows):
+def board_symbols(board):
+    """ 64 piece symbols ("." for empty) from a8 to h1, in display order """
+    symbols = []
+    for rank in range(7, -1, -1):
+        for file in range(8):
+            piece = board.piece_at(chess.square(file, rank))
+            symbols.append(piece.symbol() if piece else ".")
+    return symbols
+
+def render_board(board, square_width=7, square_height=3):
+    """ Builds the whole board frame as a single rich Text renderable """
+    symbols = board_symbols(board)
+    coord_line = "  " + "".join(f.center(square_width) for f in "abcdefgh")
+
+    frame = Text(coord_line + "\n")
+    for r_idx in range(8):
         rank = 8 - r_idx
-        squares = row.split(" ")
+        for h in range(square_height):
+            rank_label = f"{rank}" if h == square_height // 2 else " "
+            frame.append(rank_label + " ")
+            for c_idx in range(8):
+                style, lines = styled_square(symbols[r_idx * 8 + c_idx], (r_idx + c_idx) % 2 == 1,
+                                             square_width, square_height)
+                frame.append(lines[h], style)
+            frame.append(" " + rank_label + "\n")
+    frame.append(coord_line)
+    return frame
 
-        lines = [["" for _ in range(len(squares))] for _ in range(square_height)]
+def print_rich_board(board, square_width=7, square_height=3):
+    console.print(render_board(board, square_width, square_height))
 
-        for c_idx, sq in enumerate(squares):
-            is_dark = (r_idx + c_idx) % 2 == 1
-            bg = DARK_SQUARE if is_dark else LIGHT_SQUARE
-            color = piece_color(sq)
-            style = Style(bgcolor=bg, color=color, bold=True)
+# Rows kept free under the board for the recommendations and the prompt
+TEXT_ROWS = 10
 
-            piece_char = UNICODE_PIECES[sq]
+class LiveBoard:
+    """
+    Keeps the board pinned to the top of the terminal. The first show() clears
+    the screen, draws the full frame and limits scrolling to the rows below
+    it, so the text printed between moves cannot push the board off screen.
+    Later calls only rewrite the squares whose piece changed
+    (cursor-addressed, one buffered write), then clear the text area; if
+    nothing changed they write nothing. Falls back to full prints when the
+    console is not an interactive terminal (or a legacy Windows console), or
+    is too small for the board plus TEXT_ROWS of text. Call close() to
+    restore normal scrolling.
+    """
 
-            for h in range(square_height):
-                if h == square_height // 2:
-                    lines[h][c_idx] = f"[{style}]{piece_char.center(square_width)}[/{style}]"
-                else:
-                    lines[h][c_idx] = f"[{style}]{' ' * square_width}[/{style}]"
+    def __init__(self, console, square_width=7, square_height=3):
+        self.console = console
+        self.square_width = square_width
+        self.square_height = square_height
+        self.frame_height = 8 * square_height + 2
+        self.frame_width = 8 * square_width + 4
+        self.symbols = None
+        self.size = None
 
-        for h in range(square_height):
-            left_rank = f"{rank}" if h == square_height // 2 else " "
-            right_rank = f"{rank}" if h == square_height // 2 else " "
-            console.print(left_rank + " " + "".join(lines[h]) + " " + right_rank)
+    def _ansi_square(self, sq, is_dark):
+        """ Cached terminal escape strings for each line of one square """
+        color_system = _COLOR_SYSTEMS.get(self.console.color_system)
+        key = (sq, is_dark, self.square_width, self.square_height, color_system)
+        cached = _ANSI_CACHE.get(key)
+        if cached is None:
+            style, lines = styled_square(sq, is_dark, self.square_width, self.square_height)
+            if color_system is None:
+                cached = lines
+            else:
+                cached = tuple(style.render(line, color_system=color_system) for line in lines)
+            _ANSI_CACHE[key] = cached
+        return cached
+
+    def _fits(self, size):
+        # Legacy Windows consoles print escape sequences instead of running them
+        return (self.console.is_terminal and not self.console.legacy_windows
+                and size.width >= self.frame_width
+                and size.height >= self.frame_height + TEXT_ROWS)
+
+    def show(self, board):
+        """ Draws the board; returns the number of squares redrawn """
+        symbols = board_symbols(board)
+        size = self.console.size
+
+        if not self._fits(size):
+            if self.size is not None:
+                self.close()
+            self.console.print(render_board(board, self.square_width, self.square_height))
+            self.symbols = symbols
+            return 64
+
+        text_row = self.frame_height + 1
+        if self.symbols is None or self.size != size:
+            # Full frame, then confine scrolling to the rows below it
+            self.console.file.write("\x1b[r\x1b[2J\x1b[H")
+            self.console.print(render_board(board, self.square_width, self.square_height))
+            self.console.file.write(f"\x1b[{text_row};{size.height}r\x1b[{text_row};1H")
+            self.console.file.flush()
+            self.symbols = symbols
+            self.size = size
+            return 64
 
-    # --- Bottom file coordinates ---
-    console.print(coord_line)
+        changed = [i for i in range(64) if symbols[i] != self.symbols[i]]
+        if not changed:
+            # Same position (e.g. after an invalid move): keep the text on screen
+            return 0
 
-def run_recommender():
-    print("=== AI Chess Recommender ===")
-    print("Type 'quit' to exit.\n")
+        out = []
+        for i in changed:
+            r_idx, c_idx = divmod(i, 8)
+            column = 3 + c_idx * self.square_width
+            for h, line in enumerate(self._ansi_square(symbols[i], (r_idx + c_idx) % 2 == 1)):
+                out.append(f"\x1b[{2 + r_idx * self.square_height + h};{column}H{line}")
+        out.append(f"\x1b[{text_row};1H\x1b[J")
+
+        self.console.file.write("".join(out))
+        self.console.file.flush()
+        self.symbols = symbols
+        return len(changed)
+
+    def close(self):
+        """ Restores full-screen scrolling and leaves the cursor at the bottom """
+        if self.size is not None:
+            self.console.file.write(f"\x1b[r\x1b[{self.size.height};1H\n")
+            self.console.file.flush()
+            self.size = None
+
+def run_recommender(launch_time=None):
+    """ launch_time is a time.perf_counter() reading taken when the program started """
+    if launch_time is None:
+        launch_time = time.perf_counter()
 
     board = chess.Board()
     stockfish_path = os.path.join(BASE_DIR, "stockfish", "stockfish.exe")
-    stockfish = Stockfish(path=stockfish_path, depth=15, parameters={"Threads": 2, "Minimum Thinking Time": 30})
+    stockfish = BackgroundStockfish(stockfish_path, depth=15, parameters={"Threads": 2, "Minimum Thinking Time": 30})
 
     SEARCH_DEPTH = 3
 
-    while True:
-        print_rich_board(board)
-        print()
-
-        # --- Run Custom AI with metrics ---
-        start_time = time.time()
-        # Wrap alphabeta to return metrics (nodes_visited, max_depth_reached, pruning_count)
-        score, ai_move, metrics = alphabeta(
-            board,
-            depth=SEARCH_DEPTH,
-            alpha=-1e9,
-            beta=1e9,
-            maximizing=board.turn,
-        )
-        elapsed = time.time() - start_time
-        nodes = metrics.get("nodes_visited", 0)
-        max_depth = metrics.get("max_depth_reached", 0)
-        prunes = metrics.get("pruning_count", 0)
-        nodes_per_sec = nodes / elapsed if elapsed > 0 else 0
-        prune_efficiency = (prunes / nodes * 100) if nodes > 0 else 0
-
-        print(f"Custom AI recommends: {ai_move} | Eval: {score}")
-        print(f"Search latency: {elapsed:.2f}s (goal: <1s)")
-        print(f"Nodes per second: {nodes_per_sec:.0f}")
-        print(f"Average depth reached: {max_depth}")
-        print(f"Move ordering effectiveness (pruning efficiency): {prune_efficiency:.1f}%")
-        print()
-
-        # --- Stockfish recommendation ---
-        stockfish.set_fen_position(board.fen())
-        sf_move = stockfish.get_best_move()
-        print(f"Stockfish recommends: {sf_move}")
-        print()
-
-        # --- User move input ---
-        user_input = input("Your move (SAN): ")
-        if user_input.lower() in ["quit", "exit"]:
-            break
-        try:
-            board.push_san(user_input)
-        except Exception:
-            print("Invalid move, try again.\n")
-            continue
+    live_board = LiveBoard(console)
+
+    try:
+        first_prompt = True
+        # Printed after the next redraw, which clears the text area when the board changes
+        status = None
+        while True:
+            live_board.show(board)
+            print()
+            if status:
+                print(status)
+                status = None
+
+            if first_prompt:
+                print("=== AI Chess Recommender ===")
+                print("Type 'quit' to exit.\n")
+
+            stockfish.recommend(board.fen())
+
+            # --- Run Custom AI with metrics ---
+            start_time = time.time()
+            # Wrap alphabeta to return metrics (nodes_visited, max_depth_reached, pruning_count)
+            score, ai_move, metrics = alphabeta(
+                board,
+                depth=SEARCH_DEPTH,
+                alpha=-1e9,
+                beta=1e9,
+                maximizing=board.turn,
+            )
+            elapsed = time.time() - start_time
+            nodes = metrics.get("nodes_visited", 0)
+            max_depth = metrics.get("max_depth_reached", 0)
+            prunes = metrics.get("pruning_count", 0)
+            nodes_per_sec = nodes / elapsed if elapsed > 0 else 0
+            prune_efficiency = (prunes / nodes * 100) if nodes > 0 else 0
+
+            print(f"Custom AI recommends: {ai_move} | Eval: {score}")
+            if mate_in(score) is not None:
+                print(f"Forced mate in {abs(mate_in(score))}")
+            print(f"Search latency: {elapsed:.2f}s (goal: <1s)")
+            print(f"Nodes per second: {nodes_per_sec:.0f}")
+            print(f"Average depth reached: {max_depth}")
+            print(f"Move ordering effectiveness (pruning efficiency): {prune_efficiency:.1f}%")
+            print()
+
+            # --- Stockfish recommendation (searched alongside the custom AI) ---
+            sf_move = stockfish.best_move()
+            if stockfish.error is None:
+                print(f"Stockfish recommends: {sf_move}")
+            else:
+                print(f"Stockfish unavailable: {stockfish.error}")
+            print()
+
+            if first_prompt:
+                first_prompt = False
+                startup_time = time.perf_counter() - launch_time
+                status = "" if startup_time < STARTUP_TARGET else " OVER TARGET"
+                print(f"Time to first prompt: {startup_time:.2f}s (goal: <{STARTUP_TARGET}s){status}")
+                print()
+
+            # --- User move input ---
+            user_input = input("Your move (SAN): ")
+            if user_input.lower() in ["quit", "exit"]:
+                break
+            try:
+                board.push_san(user_input)
+            except Exception:
+                status = "Invalid move, try again.\n"
+                continue
 
-        print("\n--- Move accepted ---\n")
+            status = "--- Move accepted ---\n"
 
-        if board.is_game_over():
-            print_rich_board(board)
-            print("Game over:", board.result())
-            break
+            if board.is_game_over():
+                live_board.show(board)
+                print()
+                print(status)
+                print("Game over:", board.result())
+                break
+    finally:
+        live_board.close()
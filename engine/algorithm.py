@@ -1,39 +1,108 @@
 # RUN TESTS USING python -m tests.test_scenarios
 import chess
-from .eval_function import EvaluationFunction
+from .eval_function import MATE_SCORE, EvaluationFunction
+from .repetition import RepetitionTable
 
 evaluator = EvaluationFunction()
 
+# Zobrist keys of the game + search path, rebuilt at the root of every search
+HISTORY = RepetitionTable()
+
 TRANSPOSITION_TABLE = {}
 
+# Mate scores are MATE_SCORE minus the distance to mate in plies from the root,
+# so the search prefers the fastest mate and the slowest loss
+MATE_THRESHOLD = MATE_SCORE - 1000
+
 NODE_COUNT = 0
 MAX_NODES = 20000  # speed vs accuracy
 #MAX_NODES = 1000000
 
 
-def evaluate(board: chess.Board) -> int:
-    return evaluator.evaluate_board(board)
+def evaluate(board: chess.Board, moves=None, alpha=None, beta=None) -> int:
+    return evaluator.evaluate_board(board, HISTORY, moves, alpha, beta)
+
+
+def mate_in(score):
+    """ Moves until mate for a mate score (positive: White mates, negative: Black mates), else None """
+    if score is None or abs(score) < MATE_THRESHOLD:
+        return None
+    plies = MATE_SCORE - abs(score)
+    moves = (plies + 1) // 2
+    return moves if score > 0 else -moves
+
+
+def score_to_tt(score, ply):
+    """ Mate scores are stored relative to the node so they survive transpositions """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    """ Inverse of score_to_tt: re-bases a stored mate score on the current ply """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def mated_score():
+    """ Score for the side to move when it is checkmated at the current ply """
+    return -(MATE_SCORE - HISTORY.ply)
+
+
+def order_moves(board, moves):
+    """ Captures first, then checks; gives_check avoids a push/pop per move """
+    def move_score(move):
+        s = 0
+        if board.is_capture(move):
+            s += 100
+        if board.gives_check(move):
+            s += 50
+        return s
+
+    return sorted(moves, key=move_score, reverse=True)
 
 
-def quiescence(board, alpha, beta):
+def quiescence(board, alpha, beta, moves=None):
     """
     Extends the search past depth = 0, but only through "noisy" moves
     (currently captures) to avoid evaluating unstable tactical positions.
     Results in a more stable and tactically accurate evaluation at leaf nodes,
     greatly improving overall playing strength without large depth increases.
+    Negamax: alpha, beta and the returned score are from the side to move's
+    point of view; alphabeta converts to White's once at depth 0.
+    moves is this node's legal move list if the caller already generated it;
+    it is shared with the evaluation so the node only generates moves once.
     """
-    stand_pat = evaluate(board)
+    if moves is None:
+        moves = list(board.legal_moves)
+
+    # Same scale as the main search, so mates found here are distance-adjusted too
+    if not moves and board.is_check():
+        return mated_score()
+
+    # Lazy: the stand-pat only needs to be exact when it lands near the window.
+    # evaluate() scores for White, so the window and result flip for Black.
+    if board.turn == chess.WHITE:
+        stand_pat = evaluate(board, moves, alpha, beta)
+    else:
+        stand_pat = -evaluate(board, moves, -beta, -alpha)
 
     if stand_pat >= beta:
         return beta
     if stand_pat > alpha:
         alpha = stand_pat
 
-    for move in board.legal_moves:
+    for move in moves:
         if board.is_capture(move):
-            board.push(move)
+            HISTORY.push(board, move)
             score = -quiescence(board, -beta, -alpha)
-            board.pop()
+            HISTORY.pop(board)
 
             if score >= beta:
                 return beta
@@ -50,6 +119,9 @@ def alphabeta(board, depth, alpha, beta, maximizing, metrics=None, root=False):
     """
     global NODE_COUNT
 
+    if metrics is None or root:
+        HISTORY.reset(board)
+
     if metrics is None:
         metrics = {
             "nodes_visited": 0,
@@ -61,43 +133,39 @@ def alphabeta(board, depth, alpha, beta, maximizing, metrics=None, root=False):
     metrics["nodes_visited"] += 1
     metrics["max_depth_reached"] = max(metrics["max_depth_reached"], depth)
 
-    if NODE_COUNT >= MAX_NODES:
-        fallback_move = None
-        try:
-            fallback_move = next(iter(board.legal_moves))
-        except StopIteration:
-            fallback_move = None
-        return evaluate(board), fallback_move, metrics
+    # The one move generation for this node: terminal detection, ordering,
+    # the search loop and the leaf evaluation all work from this list.
+    moves = list(board.legal_moves)
 
-    if board.is_checkmate():
-        return (-999999 if maximizing else 999999), None, metrics
+    if not moves:
+        if board.is_check():
+            mate_score = MATE_SCORE - HISTORY.ply
+            return (-mate_score if maximizing else mate_score), None, metrics
+        return 0, None, metrics
+
+    if NODE_COUNT >= MAX_NODES:
+        return evaluate(board, moves), moves[0], metrics
 
-    if board.is_stalemate() or board.is_insufficient_material():
+    # Draws by rule only end the line inside the tree: at the root the player
+    # still needs a move recommended, claimable draw or not.
+    if board.is_insufficient_material() or (HISTORY.ply > 0 and HISTORY.is_draw(board)):
         return 0, None, metrics
 
     key = (board.fen(), depth, maximizing)
     if key in TRANSPOSITION_TABLE:
         cached_score, cached_move = TRANSPOSITION_TABLE[key]
-        return cached_score, cached_move, metrics
+        return score_from_tt(cached_score, HISTORY.ply), cached_move, metrics
 
     if depth == 0:
-        qscore = quiescence(board, alpha, beta)
-        TRANSPOSITION_TABLE[key] = (qscore, None)
+        if board.turn == chess.WHITE:
+            qscore = quiescence(board, alpha, beta, moves)
+        else:
+            qscore = -quiescence(board, -beta, -alpha, moves)
+        TRANSPOSITION_TABLE[key] = (score_to_tt(qscore, HISTORY.ply), None)
         return qscore, None, metrics
 
     best_move = None
-
-    def move_score(move):
-        s = 0
-        if board.is_capture(move):
-            s += 100
-        board.push(move)
-        if board.is_check():
-            s += 50
-        board.pop()
-        return s
-
-    moves = sorted(board.legal_moves, key=move_score, reverse=True)
+    moves = order_moves(board, moves)
 
     if maximizing:
         best_score = -float("inf")
@@ -105,9 +173,9 @@ def alphabeta(board, depth, alpha, beta, maximizing, metrics=None, root=False):
             if root and best_move is None:
                 best_move = move
 
-            board.push(move)
+            HISTORY.push(board, move)
             score, _, metrics = alphabeta(board, depth - 1, alpha, beta, False, metrics, root=False)
-            board.pop()
+            HISTORY.pop(board)
 
             if score > best_score:
                 best_score = score
@@ -123,9 +191,9 @@ def alphabeta(board, depth, alpha, beta, maximizing, metrics=None, root=False):
             if root and best_move is None:
                 best_move = move
 
-            board.push(move)
+            HISTORY.push(board, move)
             score, _, metrics = alphabeta(board, depth - 1, alpha, beta, True, metrics, root=False)
-            board.pop()
+            HISTORY.pop(board)
 
             if score < best_score:
                 best_score = score
@@ -142,7 +210,7 @@ def alphabeta(board, depth, alpha, beta, maximizing, metrics=None, root=False):
         except Exception:
             best_move = None
 
-    TRANSPOSITION_TABLE[key] = (best_score, best_move)
+    TRANSPOSITION_TABLE[key] = (score_to_tt(best_score, HISTORY.ply), best_move)
     return best_score, best_move, metrics
 
 
@@ -1,9 +1,34 @@
+import json
 import chess
-import numpy as np
-import math
+
+# Score for a checkmate on the board. The search subtracts the distance to
+# mate in plies, so anything within 1000 of it reads as a forced mate.
+MATE_SCORE = 999999
+
+# Bounds on the terms the lazy stage skips. King safety + pawn structure
+# differ from the cheap score by at most KING_SAFETY_SWING (each king's safety
+# lies in [-70, +90]) plus, per pawn, between PAWN_TERM_MIN (doubled and
+# isolated) and PAWN_TERM_MAX (passed on the 7th rank) for its owner.
+KING_SAFETY_SWING = 160
+PAWN_TERM_MAX = 90
+PAWN_TERM_MIN = -25
+
+# Entries kept in the Zobrist-keyed eval cache before it is cleared
+EVAL_CACHE_SIZE = 200000
+
+# Tunable attributes written by engine.texel_tuner and read back by load_weights
+PST_NAMES = [
+    "pawn_table", "knight_table", "bishop_table", "rook_table",
+    "queen_table", "king_middle_table", "king_endgame_table"
+]
 
 class EvaluationFunction:
-    def __init__(self):
+    def __init__(self, weights_path=None):
+        self.eval_cache = {}
+
+        self.mobility_weight = 5
+        self.tempo_weight = 10
+
         self.piece_values = {
             chess.PAWN: 100,
             chess.KNIGHT: 320,
@@ -90,58 +115,116 @@ class EvaluationFunction:
            -50,-30,-30,-20,-20,-30,-30,-50
         ]
 
-    def evaluate_board(self, board):
-        """ Heuristic evaluation function that scores the board position """
-        if board.is_checkmate():
-            return -9999 if board.turn else 9999
-        
-        if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
+        if weights_path is not None:
+            self.load_weights(weights_path)
+        else:
+            self._build_square_tables()
+
+    def _build_square_tables(self):
+        """
+        Precomputes material + PST for every (colour, piece, square) as one
+        flat list, signed from White's point of view and already rank-flipped,
+        so evaluation is a single lookup per piece. Index is
+        (6 * is_black + piece_type - 1) * 64 + square; the two lists only
+        differ in which king table they use.
+        """
+        piece_tables = {
+            chess.PAWN: self.pawn_table,
+            chess.KNIGHT: self.knight_table,
+            chess.BISHOP: self.bishop_table,
+            chess.ROOK: self.rook_table,
+            chess.QUEEN: self.queen_table,
+        }
+
+        for is_endgame in (False, True):
+            piece_tables[chess.KING] = self.king_endgame_table if is_endgame else self.king_middle_table
+            values = [0] * (12 * 64)
+
+            for color in chess.COLORS:
+                sign = 1 if color == chess.WHITE else -1
+                for piece_type, table in piece_tables.items():
+                    base = (6 * (color == chess.BLACK) + piece_type - 1) * 64
+                    for square in chess.SQUARES:
+                        flipped_square = chess.square(chess.square_file(square), 7 - chess.square_rank(square))
+                        values[base + square] = sign * (self.piece_values[piece_type] + table[flipped_square])
+
+            if is_endgame:
+                self.square_values_endgame = values
+            else:
+                self.square_values_middle = values
+
+    def load_weights(self, path):
+        """ Loads tuned piece values, PSTs and scalar weights from a JSON file """
+        with open(path) as f:
+            weights = json.load(f)
+
+        for symbol, value in weights.get("piece_values", {}).items():
+            self.piece_values[chess.Piece.from_symbol(symbol).piece_type] = int(value)
+
+        for name in PST_NAMES:
+            if name in weights:
+                if len(weights[name]) != 64:
+                    raise ValueError(f"{name} must have 64 entries")
+                setattr(self, name, [int(value) for value in weights[name]])
+
+        for name in ("mobility_weight", "tempo_weight"):
+            if name in weights:
+                setattr(self, name, int(weights[name]))
+
+        self._build_square_tables()
+        self.eval_cache.clear()
+
+    def evaluate_board(self, board, repetitions=None, moves=None, alpha=None, beta=None):
+        """
+        Heuristic evaluation function that scores the board position.
+        repetitions is the search's RepetitionTable; without one, draws by rule
+        fall back to python-chess's own repetition check.
+        moves is the position's legal move list if the caller already has it.
+        Mate and stalemate are read off it (no moves + check / no check) and
+        it doubles as the mobility count, so moves are generated at most once.
+
+        Evaluation is staged: material, PST, mobility and tempo first. When an
+        (alpha, beta) window is given and the skipped terms cannot bring that
+        cheap score back inside it (see _positional_bounds), the cheap score is
+        returned as is: it fails low or high exactly when the full one would.
+        Full scores are cached by the RepetitionTable's Zobrist key.
+        """
+        if moves is None:
+            moves = list(board.legal_moves)
+
+        if not moves:
+            if board.is_check():
+                return -MATE_SCORE if board.turn else MATE_SCORE
             return 0
 
-        score = 0
+        if board.is_insufficient_material():
+            return 0
 
-        piece_count = len(board.piece_map())
-        is_endgame = piece_count <= 6
+        if repetitions is not None:
+            if repetitions.is_draw(board):
+                return 0
+        elif board.halfmove_clock >= 100 or board.is_repetition(3):
+            return 0
 
-        white_material = 0
-        black_material = 0
+        cache_key = repetitions.key if repetitions is not None else None
+        if cache_key is not None:
+            cached_score = self.eval_cache.get(cache_key)
+            if cached_score is not None:
+                return cached_score
 
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            
-            if piece is not None:
-                piece_value = self.piece_values[piece.piece_type]
-                
-                if piece.color == chess.WHITE:
-                    white_material += piece_value
-                else:
-                    black_material += piece_value
+        score = self._evaluate_material_and_position(board)
 
-                flipped_square = chess.square(chess.square_file(square), 7 - chess.square_rank(square))
-                
-                if piece.piece_type == chess.PAWN:
-                    pos_value = self.pawn_table[flipped_square]
-                elif piece.piece_type == chess.KNIGHT:
-                    pos_value = self.knight_table[flipped_square]
-                elif piece.piece_type == chess.BISHOP:
-                    pos_value = self.bishop_table[flipped_square]
-                elif piece.piece_type == chess.ROOK:
-                    pos_value = self.rook_table[flipped_square]
-                elif piece.piece_type == chess.QUEEN:
-                    pos_value = self.queen_table[flipped_square]
-                elif piece.piece_type == chess.KING:
-                    pos_value = self.king_endgame_table[flipped_square] if is_endgame else self.king_middle_table[flipped_square]
-                else:
-                    pos_value = 0
-                
-                score += pos_value if piece.color == chess.WHITE else -pos_value
+        # Legal moves only ever belong to the side to move
+        mobility_bonus = len(moves) * self.mobility_weight if board.turn == chess.WHITE else -len(moves) * self.mobility_weight
+        score += mobility_bonus
 
-        score += white_material - black_material
+        tempo_bonus = self.tempo_weight if board.turn == chess.WHITE else -self.tempo_weight
+        score += tempo_bonus
 
-        white_mobility = len([move for move in board.legal_moves if board.color_at(move.from_square) == chess.WHITE])
-        black_mobility = len([move for move in board.legal_moves if board.color_at(move.from_square) == chess.BLACK])
-        mobility_bonus = (white_mobility - black_mobility) * 5
-        score += mobility_bonus
+        if alpha is not None:
+            low, high = self._positional_bounds(board)
+            if score + high <= alpha or score + low >= beta:
+                return score
 
         king_safety_score = self._evaluate_king_safety(board)
         score += king_safety_score
@@ -149,9 +232,34 @@ class EvaluationFunction:
         pawn_structure_score = self._evaluate_pawn_structure(board)
         score += pawn_structure_score
 
-        tempo_bonus = 10 if board.turn == chess.WHITE else -10
-        score += tempo_bonus
-        
+        if cache_key is not None:
+            if len(self.eval_cache) >= EVAL_CACHE_SIZE:
+                self.eval_cache.clear()
+            self.eval_cache[cache_key] = score
+
+        return score
+
+    def _positional_bounds(self, board):
+        """ (low, high) range of king safety + pawn structure, from the pawn counts alone """
+        white_pawns = chess.popcount(board.pawns & board.occupied_co[chess.WHITE])
+        black_pawns = chess.popcount(board.pawns & board.occupied_co[chess.BLACK])
+        low = -KING_SAFETY_SWING + white_pawns * PAWN_TERM_MIN - black_pawns * PAWN_TERM_MAX
+        high = KING_SAFETY_SWING + white_pawns * PAWN_TERM_MAX - black_pawns * PAWN_TERM_MIN
+        return low, high
+
+    def _evaluate_material_and_position(self, board):
+        """ Material balance plus piece-square table bonuses """
+        is_endgame = chess.popcount(board.occupied) <= 6
+        values = self.square_values_endgame if is_endgame else self.square_values_middle
+
+        score = 0
+        for color_base, occupied in ((0, board.occupied_co[chess.WHITE]), (6 * 64, board.occupied_co[chess.BLACK])):
+            for base, pieces in ((color_base, board.pawns), (color_base + 64, board.knights),
+                                 (color_base + 128, board.bishops), (color_base + 192, board.rooks),
+                                 (color_base + 256, board.queens), (color_base + 320, board.kings)):
+                for square in chess.scan_forward(pieces & occupied):
+                    score += values[base + square]
+
         return score
 
     def _evaluate_king_safety(self, board):
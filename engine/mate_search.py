@@ -0,0 +1,169 @@
+import chess
+
+INFINITY = 10 ** 9
+
+MAX_MATE_NODES = 200000
+
+
+class _Node:
+    """
+    One position in the proof-number tree. OR nodes have the attacker to move
+    (one proven child proves the node), AND nodes the defender (every child
+    must be proven).
+    """
+    __slots__ = ("move", "parent", "children", "moves", "is_or", "moves_left", "proof", "disproof")
+
+    def __init__(self, move, parent, is_or, moves_left):
+        self.move = move
+        self.parent = parent
+        self.children = None
+        self.moves = None
+        self.is_or = is_or
+        self.moves_left = moves_left
+        self.proof = 1
+        self.disproof = 1
+
+
+def _candidate_moves(board, checks_only):
+    """ Attacker moves worth trying: checking moves only unless told otherwise """
+    if checks_only:
+        return [move for move in board.legal_moves if board.gives_check(move)]
+    return list(board.legal_moves)
+
+
+def _init_node(node, board, checks_only):
+    """ Sets the proof and disproof numbers of a freshly created node """
+    if node.is_or:
+        if node.moves_left == 0:
+            node.proof, node.disproof = INFINITY, 0
+            return
+        node.moves = _candidate_moves(board, checks_only)
+        if not node.moves:
+            node.proof, node.disproof = INFINITY, 0
+        else:
+            node.proof, node.disproof = 1, len(node.moves)
+    else:
+        node.moves = list(board.legal_moves)
+        if not node.moves:
+            if board.is_check():
+                node.proof, node.disproof = 0, INFINITY
+            else:
+                node.proof, node.disproof = INFINITY, 0
+        elif node.moves_left == 0:
+            # Attacker has no moves left to finish the mate
+            node.proof, node.disproof = INFINITY, 0
+        else:
+            node.proof, node.disproof = len(node.moves), 1
+
+
+def _update_numbers(node):
+    """ Recomputes a node's numbers from its children """
+    if node.is_or:
+        node.proof = min(child.proof for child in node.children)
+        node.disproof = min(INFINITY, sum(child.disproof for child in node.children))
+    else:
+        node.proof = min(INFINITY, sum(child.proof for child in node.children))
+        node.disproof = min(child.disproof for child in node.children)
+
+
+def _select_most_proving(node, board):
+    """ Walks down to the leaf that matters most, pushing moves as it goes """
+    while node.children is not None:
+        if node.is_or:
+            node = min(node.children, key=lambda child: child.proof)
+        else:
+            node = min(node.children, key=lambda child: child.disproof)
+        board.push(node.move)
+    return node
+
+
+def _expand(node, board, checks_only, metrics):
+    """ Creates and initialises every child of a leaf """
+    child_moves_left = node.moves_left - 1 if node.is_or else node.moves_left
+    node.children = []
+
+    for move in node.moves:
+        child = _Node(move, node, not node.is_or, child_moves_left)
+        board.push(move)
+        _init_node(child, board, checks_only)
+        board.pop()
+        metrics["nodes_visited"] += 1
+        node.children.append(child)
+
+    node.moves = None
+    _update_numbers(node)
+
+
+def _mate_length(node):
+    """ Moves to mate in a proven subtree, with best defence """
+    if node.children is None:
+        return 0
+    lengths = [_mate_length(child) for child in node.children if child.proof == 0]
+    if node.is_or:
+        return 1 + min(lengths)
+    return max(lengths)
+
+
+def _mating_line(root):
+    """ Principal variation of the proof: fastest mate against longest defence """
+    line = []
+    node = root
+    while node.children is not None:
+        proven = [child for child in node.children if child.proof == 0]
+        if node.is_or:
+            node = min(proven, key=_mate_length)
+        else:
+            node = max(proven, key=_mate_length)
+        line.append(node.move)
+    return line
+
+
+def prove_mate(board: chess.Board, n: int, checks_only=True, max_nodes=MAX_MATE_NODES, metrics=None):
+    """
+    Proof-number search for a forced mate in at most n moves by the side to move.
+    Returns (result, line, metrics): result is True (mate proven), False
+    (refuted) or None (node budget ran out). With checks_only the attacker
+    only tries checking moves, which keeps puzzle trees small but misses mates
+    that need a quiet move.
+    """
+    if metrics is None:
+        metrics = {"nodes_visited": 0}
+
+    board = board.copy(stack=False)
+    root = _Node(None, None, True, n)
+    _init_node(root, board, checks_only)
+    metrics["nodes_visited"] += 1
+
+    while root.proof != 0 and root.disproof != 0 and metrics["nodes_visited"] < max_nodes:
+        node = _select_most_proving(root, board)
+        _expand(node, board, checks_only, metrics)
+
+        while node.parent is not None:
+            board.pop()
+            node = node.parent
+            _update_numbers(node)
+
+    if root.proof == 0:
+        return True, _mating_line(root), metrics
+    if root.disproof == 0:
+        return False, None, metrics
+    return None, None, metrics
+
+
+def mate_search(board: chess.Board, max_moves: int, checks_only=True, max_nodes=MAX_MATE_NODES):
+    """
+    Looks for the shortest forced mate of at most max_moves moves.
+    Runs prove_mate for n = 1, 2, ... so the first proof found is the shortest.
+    Returns (mate_in, line, metrics); mate_in and line are None if no mate was
+    proven within the node budget.
+    """
+    metrics = {"nodes_visited": 0}
+
+    for n in range(1, max_moves + 1):
+        result, line, metrics = prove_mate(board, n, checks_only, max_nodes, metrics)
+        if result:
+            return len(line) // 2 + 1, line, metrics
+        if result is None:
+            break
+
+    return None, None, metrics
@@ -0,0 +1,250 @@
+# RUN USING python -m engine.packed_positions games.pgn positions.bin
+import argparse
+import os
+import re
+import struct
+
+import chess
+import chess.pgn
+import numpy as np
+
+# One position per 32-byte record:
+#   occupancy  8  bitboard of occupied squares
+#   pieces    16  one nibble per occupied square, in ascending square order
+#   flags      1  bit 0 black to move, bits 1-4 castling rights K Q k q
+#   ep_square  1  en passant square, NO_EP_SQUARE if none
+#   halfmove   1  halfmove clock (clamped to 255)
+#   fullmove   2  fullmove number
+#   result     1  game result for White: 0 loss, 1 draw, 2 win, NO_RESULT if unlabelled
+#   score      2  evaluation in centipawns for White, NO_SCORE if unlabelled
+POSITION_DTYPE = np.dtype([
+    ("occupancy", "<u8"),
+    ("pieces", "u1", 16),
+    ("flags", "u1"),
+    ("ep_square", "u1"),
+    ("halfmove", "u1"),
+    ("fullmove", "<u2"),
+    ("result", "u1"),
+    ("score", "<i2"),
+])
+
+NO_EP_SQUARE = 64
+NO_RESULT = 255
+NO_SCORE = -32768
+
+RESULT_CODES = {"1-0": 2, "0-1": 0, "1/2-1/2": 1}
+
+CASTLING_FLAGS = [
+    (chess.BB_H1, 1 << 1),
+    (chess.BB_A1, 1 << 2),
+    (chess.BB_H8, 1 << 3),
+    (chess.BB_A8, 1 << 4),
+]
+
+
+def _piece_code(piece):
+    """ Nibble for a piece: 0-5 white pawn..king, 8-13 black pawn..king """
+    return piece.piece_type - 1 + (0 if piece.color == chess.WHITE else 8)
+
+
+def encode_position(board: chess.Board, result=None, score=None):
+    """
+    Packs a board into a POSITION_DTYPE record. result is the game result for
+    White (1, 0.5, 0 or a "1-0"-style token), score a centipawn evaluation.
+    Standard chess only: castling rights must be on the original rook squares.
+    """
+    record = np.zeros((), dtype=POSITION_DTYPE)
+    record["occupancy"] = board.occupied
+
+    nibbles = [_piece_code(board.piece_at(square)) for square in chess.scan_forward(board.occupied)]
+    if len(nibbles) > 32:
+        raise ValueError("more than 32 pieces cannot be packed")
+    nibbles += [0] * (32 - len(nibbles))
+    record["pieces"] = [nibbles[i] | (nibbles[i + 1] << 4) for i in range(0, 32, 2)]
+
+    flags = 0 if board.turn == chess.WHITE else 1
+    for rook_square, flag in CASTLING_FLAGS:
+        if board.castling_rights & rook_square:
+            flags |= flag
+    if board.castling_rights & ~(chess.BB_A1 | chess.BB_H1 | chess.BB_A8 | chess.BB_H8):
+        raise ValueError("only standard castling rights can be packed")
+    record["flags"] = flags
+
+    record["ep_square"] = board.ep_square if board.ep_square is not None else NO_EP_SQUARE
+    record["halfmove"] = min(board.halfmove_clock, 255)
+    record["fullmove"] = min(board.fullmove_number, 65535)
+
+    if result is None:
+        record["result"] = NO_RESULT
+    elif isinstance(result, str):
+        record["result"] = RESULT_CODES[result]
+    else:
+        record["result"] = int(round(result * 2))
+
+    record["score"] = NO_SCORE if score is None else max(-32767, min(32767, int(score)))
+    return record
+
+
+# Same layout as POSITION_DTYPE, for unpacking raw records without NumPy scalars
+RECORD_STRUCT = struct.Struct("<Q16sBBBHBh")
+
+
+def _decode_fields(occupancy, pieces, flags, ep_square, halfmove, fullmove):
+    """ Builds a chess.Board from the unpacked record fields """
+    piece_map = {}
+    for i, square in enumerate(chess.scan_forward(occupancy)):
+        nibble = (pieces[i >> 1] >> (4 * (i & 1))) & 0xF
+        piece_map[square] = chess.Piece(nibble % 8 + 1, chess.WHITE if nibble < 8 else chess.BLACK)
+
+    board = chess.Board(None)
+    board.set_piece_map(piece_map)
+
+    board.turn = chess.BLACK if flags & 1 else chess.WHITE
+    board.castling_rights = 0
+    for rook_square, flag in CASTLING_FLAGS:
+        if flags & flag:
+            board.castling_rights |= rook_square
+
+    board.ep_square = None if ep_square == NO_EP_SQUARE else ep_square
+    board.halfmove_clock = halfmove
+    board.fullmove_number = fullmove
+    return board
+
+
+def decode_position(record) -> chess.Board:
+    """ Rebuilds a chess.Board (without move history) from a packed record """
+    return _decode_fields(*RECORD_STRUCT.unpack(record.tobytes())[:6])
+
+
+def result_value(record):
+    """ Game result for White as 1, 0.5 or 0, or None if unlabelled """
+    code = int(record["result"])
+    return None if code == NO_RESULT else code / 2
+
+
+class PositionWriter:
+    """ Appends packed records to a file; use as a context manager """
+
+    def __init__(self, path, append=False):
+        self.file = open(path, "ab" if append else "wb")
+        self.count = 0
+
+    def write(self, board, result=None, score=None):
+        self.file.write(encode_position(board, result, score).tobytes())
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PositionFile:
+    """
+    Memory-mapped, read-only view of a packed position file. records is a
+    NumPy structured array backed by the file, so field views such as
+    records["result"] or records["occupancy"] cost no copy or parse.
+    """
+
+    def __init__(self, path):
+        if os.path.getsize(path) == 0:
+            # mmap refuses empty files; an empty source still converts to one
+            self.records = np.zeros(0, dtype=POSITION_DTYPE)
+        else:
+            self.records = np.memmap(path, dtype=POSITION_DTYPE, mode="r")
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index) -> chess.Board:
+        return decode_position(self.records[index])
+
+    def boards(self, start=0, stop=None):
+        """ Yields a chess.Board per record, unpacked straight from the mapped bytes """
+        raw = self.records[start:stop].view(np.uint8)
+        for fields in RECORD_STRUCT.iter_unpack(raw):
+            yield _decode_fields(*fields[:6])
+
+    def labelled(self):
+        """ Yields (board, result) for every record that carries a game result """
+        raw = self.records.view(np.uint8)
+        for fields in RECORD_STRUCT.iter_unpack(raw):
+            if fields[6] != NO_RESULT:
+                yield _decode_fields(*fields[:6]), fields[6] / 2
+
+
+def read_epd(path):
+    """
+    Yields (board, result) from a FEN/EPD file, one position per line. result
+    is None unless the line carries one ("1-0" style token or [0.5]).
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            match = re.search(r"\[([0-9.]+)\]", line)
+            if match:
+                result = float(match.group(1))
+            else:
+                token = next((t for t in RESULT_CODES if t in line), None)
+                result = RESULT_CODES[token] / 2 if token else None
+
+            fields = line.split()
+            board = chess.Board(None)
+            board.set_epd(" ".join(fields[:4]))
+            if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+                board.halfmove_clock = int(fields[4])
+                board.fullmove_number = int(fields[5])
+            yield board, result
+
+
+def read_pgn(path, skip_plies=0):
+    """ Yields (board, result) for every position of every game in a PGN file """
+    with open(path) as f:
+        while True:
+            game = chess.pgn.read_game(f)
+            if game is None:
+                break
+
+            code = RESULT_CODES.get(game.headers.get("Result"))
+            result = None if code is None else code / 2
+            board = game.board()
+            for ply, move in enumerate(game.mainline_moves()):
+                board.push(move)
+                if ply + 1 >= skip_plies:
+                    yield board.copy(stack=False), result
+
+
+def convert(source, destination, skip_plies=0):
+    """ Converts a .pgn or FEN/EPD text file to a packed position file """
+    if source.endswith(".pgn"):
+        positions = read_pgn(source, skip_plies)
+    else:
+        positions = read_epd(source)
+
+    with PositionWriter(destination) as writer:
+        for board, result in positions:
+            writer.write(board, result)
+    return writer.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert PGN/EPD/FEN files to packed 32-byte positions")
+    parser.add_argument("source", help=".pgn file, or text file with one FEN/EPD per line")
+    parser.add_argument("destination", help="packed output file (.bin)")
+    parser.add_argument("--skip-plies", type=int, default=0, help="PGN only: skip the first N plies of each game")
+    args = parser.parse_args(argv)
+
+    count = convert(args.source, args.destination, args.skip_plies)
+    print(f"Wrote {count} positions to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+# RUN USING python -m engine.perft --help
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+
+# Standard perft positions with known leaf counts per depth (index 0 = depth 1).
+PERFT_POSITIONS = {
+    "startpos": (
+        chess.STARTING_FEN,
+        [20, 400, 8902, 197281, 4865609],
+    ),
+    "kiwipete": (
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603],
+    ),
+    "position3": (
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624],
+    ),
+    "position4": (
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    "position5": (
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487],
+    ),
+    "position6": (
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594],
+    ),
+}
+
+
+def perft(board: chess.Board, depth: int, cache=None) -> int:
+    """
+    Counts the leaf nodes of the legal move tree to the given depth.
+    Leaves are bulk-counted from the move list at depth 1, so the timing is
+    dominated by legal move generation (the same path alphabeta uses).
+    If a cache dict is given, subtree counts are stored by (position key, depth)
+    so transpositions are only expanded once. The key is python-chess's
+    bitboard tuple rather than a Zobrist hash, which would cost more to
+    compute from scratch than most transpositions save.
+    """
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return board.legal_moves.count()
+
+    if cache is not None:
+        key = (board._transposition_key(), depth)
+        if key in cache:
+            return cache[key]
+
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1, cache)
+        board.pop()
+
+    if cache is not None:
+        cache[key] = nodes
+    return nodes
+
+
+def _perft_root_move(args):
+    """ Worker entry point: count one root move's subtree in a separate process """
+    fen, uci, depth, use_cache = args
+    board = chess.Board(fen)
+    board.push(chess.Move.from_uci(uci))
+    return uci, perft(board, depth - 1, {} if use_cache else None)
+
+
+def divide(board: chess.Board, depth: int, use_cache=False, jobs=1):
+    """
+    Returns a {move_uci: leaf_count} dict, one entry per root move.
+    With jobs > 1 the root moves are split across a process pool; each worker
+    keeps its own cache.
+    """
+    if depth < 1:
+        raise ValueError("divide needs depth >= 1")
+
+    moves = list(board.legal_moves)
+
+    if jobs > 1:
+        fen = board.fen()
+        tasks = [(fen, move.uci(), depth, use_cache) for move in moves]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return dict(pool.map(_perft_root_move, tasks))
+
+    cache = {} if use_cache else None
+    counts = {}
+    for move in moves:
+        board.push(move)
+        counts[move.uci()] = perft(board, depth - 1, cache)
+        board.pop()
+    return counts
+
+
+def run_perft(board: chess.Board, depth: int, use_cache=False, jobs=1):
+    """ Runs perft and returns (nodes, elapsed_seconds, per-move counts) """
+    start_time = time.perf_counter()
+    counts = divide(board, depth, use_cache=use_cache, jobs=jobs)
+    elapsed = time.perf_counter() - start_time
+    return sum(counts.values()), elapsed, counts
+
+
+def run_benchmark(depth: int, use_cache=False, jobs=1, names=None):
+    """
+    Runs perft on the standard positions, checks each count against the known
+    value and prints leaf nodes per second. Returns True if every count matched.
+    """
+    all_ok = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for name in names or PERFT_POSITIONS:
+        fen, expected_counts = PERFT_POSITIONS[name]
+        if depth > len(expected_counts):
+            print(f"{name:<10} skipped (no reference count for depth {depth})")
+            continue
+
+        nodes, elapsed, _ = run_perft(chess.Board(fen), depth, use_cache=use_cache, jobs=jobs)
+        expected = expected_counts[depth - 1]
+        ok = nodes == expected
+        all_ok = all_ok and ok
+        total_nodes += nodes
+        total_time += elapsed
+
+        nps = nodes / elapsed if elapsed > 0 else 0
+        status = "OK" if ok else f"MISMATCH (expected {expected})"
+        print(f"{name:<10} depth {depth}: {nodes:>9} nodes  {elapsed:6.2f}s  {nps:>10.0f} nodes/s  {status}")
+
+    if total_time > 0:
+        print(f"Total: {total_nodes} nodes in {total_time:.2f}s ({total_nodes / total_time:.0f} nodes/s)")
+    return all_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft move generation test and benchmark")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen", help="run on this FEN instead of the standard positions")
+    parser.add_argument("--position", choices=sorted(PERFT_POSITIONS), action="append",
+                        help="standard position(s) to run (default: all)")
+    parser.add_argument("--divide", action="store_true", help="print the count for every root move")
+    parser.add_argument("--hash", action="store_true", help="cache subtree counts by position")
+    parser.add_argument("--jobs", type=int, default=1, help="split root moves across N processes")
+    args = parser.parse_args(argv)
+
+    if args.fen is None and not args.divide:
+        return 0 if run_benchmark(args.depth, args.hash, args.jobs, args.position) else 1
+
+    if args.fen is not None:
+        fens = [args.fen]
+    else:
+        fens = [PERFT_POSITIONS[name][0] for name in args.position or PERFT_POSITIONS]
+
+    for fen in fens:
+        board = chess.Board(fen)
+        nodes, elapsed, counts = run_perft(board, args.depth, use_cache=args.hash, jobs=args.jobs)
+        print(fen)
+        if args.divide:
+            for uci in sorted(counts):
+                print(f"{uci}: {counts[uci]}")
+        nps = nodes / elapsed if elapsed > 0 else 0
+        print(f"Nodes: {nodes}  Time: {elapsed:.2f}s  Nodes/s: {nps:.0f}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
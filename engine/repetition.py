@@ -0,0 +1,75 @@
+import chess
+from . import zobrist
+
+
+class RepetitionTable:
+    """
+    Stack of Zobrist keys for the positions on the current game + search path.
+    Replaces board.can_claim_draw(), which replays the move stack (and may
+    generate legal moves) on every call, so its cost grows with game length.
+    """
+
+    def __init__(self, board=None):
+        self.keys = []
+        self.root_length = 0
+        if board is not None:
+            self.reset(board)
+
+    def reset(self, board: chess.Board):
+        """
+        Rebuilds the stack from the board's move history. Only the positions
+        since the last irreversible move can repeat, so the replay stops there.
+        """
+        replay = board.copy()
+        keys = [zobrist.zobrist_key(replay)]
+
+        for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+            replay.pop()
+            keys.append(zobrist.zobrist_key(replay))
+
+        keys.reverse()
+        self.keys = keys
+        self.root_length = len(keys)
+
+    @property
+    def ply(self) -> int:
+        """ Plies played since the last reset, i.e. distance from the search root """
+        return len(self.keys) - self.root_length
+
+    @property
+    def key(self) -> int:
+        """ Zobrist key of the current position """
+        return self.keys[-1]
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """ Plays the move on the board and records the new position's key """
+        self.keys.append(zobrist.push(board, move, self.keys[-1]))
+
+    def pop(self, board: chess.Board):
+        """ Takes back the last move on the board and drops its key """
+        board.pop()
+        self.keys.pop()
+
+    def is_repetition(self, board: chess.Board, count=3) -> bool:
+        """
+        True if the current position has occurred `count` times. Captures and
+        pawn moves reset the halfmove clock and can never be undone, so only the
+        last halfmove_clock plies are scanned, same side to move only.
+        """
+        if len(self.keys) < 5:
+            return False
+
+        key = self.keys[-1]
+        limit = min(board.halfmove_clock, len(self.keys) - 1)
+        seen = 1
+
+        for ply in range(4, limit + 1, 2):
+            if self.keys[-1 - ply] == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def is_draw(self, board: chess.Board) -> bool:
+        """ Draw by threefold repetition or the fifty-move rule """
+        return board.halfmove_clock >= 100 or self.is_repetition(board)
@@ -0,0 +1,283 @@
+# RUN USING python -m engine.texel_tuner positions.epd --out tuned_weights.json
+import argparse
+import json
+import time
+
+import chess
+import numpy as np
+
+from .eval_function import PST_NAMES, EvaluationFunction
+from .packed_positions import PositionFile, read_epd
+
+# Feature layout: material per piece type (king excluded), one feature per
+# PST entry, then mobility and tempo. A position's evaluation is
+# features . weights + offset, where offset holds the terms that are not tuned
+# (king safety and pawn structure).
+MATERIAL_TYPES = [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]
+PST_OFFSET = len(MATERIAL_TYPES)
+MOBILITY_INDEX = PST_OFFSET + 64 * len(PST_NAMES)
+TEMPO_INDEX = MOBILITY_INDEX + 1
+NUM_FEATURES = TEMPO_INDEX + 1
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class FeatureSet:
+    """
+    Sparse (CSR) feature matrix for a set of positions, extracted once so
+    every tuning epoch is pure NumPy work. indptr[i]:indptr[i+1] selects the
+    (indices, values) of position i.
+    """
+
+    def __init__(self, indptr, indices, values, offsets, results):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.float64)
+        self.results = np.asarray(results, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.results)
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """ Yields (rows, indices, values, offsets, results) for position ranges """
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            lo, hi = self.indptr[start], self.indptr[stop]
+            rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+            yield (rows, self.indices[lo:hi], self.values[lo:hi],
+                   self.offsets[start:stop], self.results[start:stop])
+
+    def save(self, path):
+        np.savez_compressed(path, indptr=self.indptr, indices=self.indices, values=self.values,
+                            offsets=self.offsets, results=self.results)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["indptr"], data["indices"], data["values"], data["offsets"], data["results"])
+
+
+def extract_features(board: chess.Board, evaluator: EvaluationFunction, moves=None):
+    """
+    Returns ({feature_index: value}, offset) for a non-terminal position, built
+    from the same terms evaluate_board uses, so that
+    sum(value * weight) + offset == evaluate_board(board).
+    """
+    if moves is None:
+        moves = list(board.legal_moves)
+
+    features = {}
+    piece_map = board.piece_map()
+    is_endgame = len(piece_map) <= 6
+
+    for square, piece in piece_map.items():
+        sign = 1 if piece.color == chess.WHITE else -1
+
+        if piece.piece_type != chess.KING:
+            index = piece.piece_type - 1
+            features[index] = features.get(index, 0) + sign
+            table = piece.piece_type - 1
+        else:
+            table = PST_NAMES.index("king_endgame_table" if is_endgame else "king_middle_table")
+
+        # Same rank flip evaluate_board applies
+        flipped_square = chess.square(chess.square_file(square), 7 - chess.square_rank(square))
+        index = PST_OFFSET + 64 * table + flipped_square
+        features[index] = features.get(index, 0) + sign
+
+    side = 1 if board.turn == chess.WHITE else -1
+    features[MOBILITY_INDEX] = side * len(moves)
+    features[TEMPO_INDEX] = side
+
+    offset = evaluator._evaluate_king_safety(board) + evaluator._evaluate_pawn_structure(board)
+    return {index: value for index, value in features.items() if value}, offset
+
+
+def build_feature_set(labelled_positions, evaluator=None):
+    """
+    Extracts features for an iterable of (board, result) pairs, result being
+    the game result from White's point of view (1, 0.5 or 0). Positions that
+    evaluate_board scores by rule (mate, stalemate, insufficient material,
+    fifty-move rule) are skipped since no weight can change their score.
+    """
+    evaluator = evaluator or EvaluationFunction()
+    indptr = [0]
+    indices = []
+    values = []
+    offsets = []
+    results = []
+
+    for board, result in labelled_positions:
+        moves = list(board.legal_moves)
+        if not moves or board.is_insufficient_material() or board.halfmove_clock >= 100:
+            continue
+
+        features, offset = extract_features(board, evaluator, moves)
+        indices.extend(features.keys())
+        values.extend(features.values())
+        indptr.append(len(indices))
+        offsets.append(offset)
+        results.append(result)
+
+    return FeatureSet(indptr, indices, values, offsets, results)
+
+
+def read_labelled_positions(path):
+    """
+    Yields (board, result) pairs from a packed position file (.bin) or a text
+    file with one FEN/EPD plus result per line (1-0, 0-1, 1/2-1/2 or [0.5]).
+    """
+    if path.endswith(".bin"):
+        yield from PositionFile(path).labelled()
+        return
+
+    for board, result in read_epd(path):
+        if result is None:
+            raise ValueError(f"no result found for position: {board.fen()}")
+        yield board, result
+
+
+def weights_from_evaluator(evaluator: EvaluationFunction):
+    """ Flattens the evaluator's tunable parameters into one weight vector """
+    weights = np.zeros(NUM_FEATURES, dtype=np.float64)
+    for i, piece_type in enumerate(MATERIAL_TYPES):
+        weights[i] = evaluator.piece_values[piece_type]
+    for t, name in enumerate(PST_NAMES):
+        weights[PST_OFFSET + 64 * t:PST_OFFSET + 64 * (t + 1)] = getattr(evaluator, name)
+    weights[MOBILITY_INDEX] = evaluator.mobility_weight
+    weights[TEMPO_INDEX] = evaluator.tempo_weight
+    return weights
+
+
+def save_weights(path, weights):
+    """ Writes a weight vector in the JSON format EvaluationFunction.load_weights reads """
+    rounded = [int(round(w)) for w in weights]
+    data = {
+        "piece_values": {
+            chess.piece_symbol(piece_type).upper(): rounded[i]
+            for i, piece_type in enumerate(MATERIAL_TYPES)
+        },
+        "mobility_weight": rounded[MOBILITY_INDEX],
+        "tempo_weight": rounded[TEMPO_INDEX],
+    }
+    for t, name in enumerate(PST_NAMES):
+        data[name] = rounded[PST_OFFSET + 64 * t:PST_OFFSET + 64 * (t + 1)]
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def _sigmoid(scores, k):
+    """ Expected score for White from a centipawn evaluation """
+    return 1.0 / (1.0 + np.power(10.0, -k * scores / 400.0))
+
+
+def evaluate_feature_set(features: FeatureSet, weights, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Evaluations of every position under the given weights """
+    scores = []
+    for rows, indices, values, offsets, _ in features.chunks(chunk_size):
+        scores.append(np.bincount(rows, weights=values * weights[indices], minlength=len(offsets)) + offsets)
+    return np.concatenate(scores) if scores else np.zeros(0)
+
+
+def loss_and_gradient(features: FeatureSet, weights, k, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Mean squared error between sigmoid(eval) and the game results, plus its
+    gradient with respect to the weights, accumulated chunk by chunk.
+    """
+    total_loss = 0.0
+    gradient = np.zeros_like(weights)
+    scale = k * np.log(10.0) / 400.0
+
+    for rows, indices, values, offsets, results in features.chunks(chunk_size):
+        scores = np.bincount(rows, weights=values * weights[indices], minlength=len(offsets)) + offsets
+        predicted = _sigmoid(scores, k)
+        error = predicted - results
+        total_loss += np.dot(error, error)
+
+        d_scores = 2.0 * error * predicted * (1.0 - predicted) * scale
+        gradient += np.bincount(indices, weights=values * d_scores[rows], minlength=len(weights))
+
+    n = max(len(features), 1)
+    return total_loss / n, gradient / n
+
+
+def fit_k(features: FeatureSet, weights, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Finds the sigmoid scale that best fits the current weights (coarse then fine scan) """
+    scores = evaluate_feature_set(features, weights, chunk_size)
+    best_k, best_loss = 1.0, float("inf")
+    for step in (0.1, 0.01):
+        lo = max(best_k - 10 * step, step)
+        for k in np.arange(lo, lo + 20 * step, step):
+            error = _sigmoid(scores, k) - features.results
+            loss = np.dot(error, error) / max(len(features), 1)
+            if loss < best_loss:
+                best_k, best_loss = float(k), loss
+    return best_k
+
+
+def tune(features: FeatureSet, weights, epochs=100, learning_rate=1.0, k=1.0,
+         chunk_size=DEFAULT_CHUNK_SIZE, verbose=True):
+    """
+    Full-batch Adam on the Texel loss. Returns the tuned weight vector.
+    The weights are kept in centipawns, so learning_rate is roughly the
+    largest change per epoch for any single weight.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    m = np.zeros_like(weights)
+    v = np.zeros_like(weights)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    for epoch in range(1, epochs + 1):
+        start_time = time.perf_counter()
+        loss, gradient = loss_and_gradient(features, weights, k, chunk_size)
+
+        m = beta1 * m + (1 - beta1) * gradient
+        v = beta2 * v + (1 - beta2) * gradient * gradient
+        m_hat = m / (1 - beta1 ** epoch)
+        v_hat = v / (1 - beta2 ** epoch)
+        weights -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+        if verbose:
+            print(f"Epoch {epoch}: loss {loss:.6f} ({time.perf_counter() - start_time:.2f}s)")
+
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Texel-style tuning of the evaluation weights")
+    parser.add_argument("dataset", help="labelled positions (EPD/FEN + result per line, or a packed .bin file) or a saved .npz feature set")
+    parser.add_argument("--out", default="tuned_weights.json")
+    parser.add_argument("--weights", help="start from these weights instead of the built-in tables")
+    parser.add_argument("--save-features", help="write the extracted feature set to this .npz file")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--lr", type=float, default=1.0)
+    parser.add_argument("--k", type=float, help="sigmoid scale (fitted to the starting weights if omitted)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    evaluator = EvaluationFunction(args.weights)
+
+    start_time = time.perf_counter()
+    if args.dataset.endswith(".npz"):
+        features = FeatureSet.load(args.dataset)
+    else:
+        features = build_feature_set(read_labelled_positions(args.dataset), evaluator)
+    print(f"Loaded {len(features)} positions in {time.perf_counter() - start_time:.1f}s")
+
+    if args.save_features:
+        features.save(args.save_features)
+
+    weights = weights_from_evaluator(evaluator)
+    k = args.k if args.k is not None else fit_k(features, weights, args.chunk_size)
+    print(f"K = {k:.3f}")
+
+    weights = tune(features, weights, args.epochs, args.lr, k, args.chunk_size)
+    save_weights(args.out, weights)
+    print(f"Tuned weights written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+import chess
+import chess.polyglot
+
+RANDOM_ARRAY = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+
+_hasher = chess.polyglot.ZobristHasher(RANDOM_ARRAY)
+
+
+def zobrist_key(board: chess.Board) -> int:
+    """ Full Polyglot Zobrist key of the position, computed from scratch """
+    return _hasher(board)
+
+
+def _piece_keys(board, squares):
+    """ XOR of the piece keys for whatever stands on the given squares """
+    key = 0
+    for square in squares:
+        piece_type = board.piece_type_at(square)
+        if piece_type:
+            color = board.color_at(square)
+            key ^= RANDOM_ARRAY[64 * ((piece_type - 1) * 2 + color) + square]
+    return key
+
+
+def _state_keys(board):
+    """ XOR of the castling, en passant and side-to-move keys """
+    return _hasher.hash_castling(board) ^ _hasher.hash_ep_square(board) ^ _hasher.hash_turn(board)
+
+
+def push(board: chess.Board, move: chess.Move, key: int) -> int:
+    """
+    Plays the move on the board and returns the updated Zobrist key.
+    Only the squares the move touches are rehashed, so the key stays equal to
+    zobrist_key(board) without walking the whole board after every push.
+    """
+    squares = [move.from_square, move.to_square]
+
+    if board.kings & chess.BB_SQUARES[move.from_square] and board.is_castling(move):
+        back_rank = chess.BB_RANK_1 if board.turn == chess.WHITE else chess.BB_RANK_8
+        squares = list(chess.scan_forward(back_rank))
+    elif move.to_square == board.ep_square and board.pawns & chess.BB_SQUARES[move.from_square]:
+        squares.append(chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square)))
+
+    key ^= _piece_keys(board, squares) ^ _state_keys(board)
+    board.push(move)
+    key ^= _piece_keys(board, squares) ^ _state_keys(board)
+    return key
@@ -1,4 +1,8 @@
+import time
+
+LAUNCH_TIME = time.perf_counter()
+
 from cli.recommender import run_recommender
 
 if __name__ == "__main__":
-    run_recommender()
\ No newline at end of file
+    run_recommender(LAUNCH_TIME)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import io
+import re
+import chess
+from rich.console import Console
+from cli.recommender import LiveBoard, render_board
+
+
+def make_console(terminal=True, width=100, height=40):
+    return Console(file=io.StringIO(), force_terminal=terminal, color_system="truecolor", width=width, height=height)
+
+
+def test_render_board_is_one_frame():
+    frame = render_board(chess.Board())
+    lines = frame.plain.split("\n")
+    assert len(lines) == 26
+    assert lines[0].split() == list("abcdefgh")
+    assert lines[2].startswith("8 ") and lines[2].endswith(" 8")
+    assert "♜" in lines[2] and "♙" in lines[20]
+
+
+def test_live_board_only_redraws_changed_squares():
+    console = make_console()
+    live_board = LiveBoard(console)
+    board = chess.Board()
+    assert live_board.show(board) == 64
+
+    console.file.seek(0)
+    console.file.truncate()
+    board.push_san("e4")
+    assert live_board.show(board) == 2
+    # Three lines per changed square plus the final cursor move below the board
+    assert len(re.findall(r"\x1b\[\d+;\d+H", console.file.getvalue())) == 7
+
+    board.push_san("d5")
+    board.push_san("exd5")
+    assert live_board.show(board) == 3
+
+
+def test_live_board_falls_back_to_full_frames_when_not_a_terminal():
+    console = make_console(terminal=False)
+    live_board = LiveBoard(console)
+    board = chess.Board()
+    live_board.show(board)
+    board.push_san("e4")
+    assert live_board.show(board) == 64
+    assert console.file.getvalue().count("♔") == 2
+
+
+def test_live_board_survives_text_printed_below_it():
+    console = make_console()
+    live_board = LiveBoard(console)
+    board = chess.Board()
+    live_board.show(board)
+    # Scrolling is confined to the rows under the 26-row frame
+    assert "\x1b[27;40r" in console.file.getvalue()
+
+    for i in range(30):
+        console.file.write(f"recommendation line {i}\n")
+    console.file.seek(0)
+    console.file.truncate()
+
+    board.push_san("e4")
+    assert live_board.show(board) == 2
+    output = console.file.getvalue()
+    assert "\x1b[2J" not in output and "\x1b[27;1H\x1b[J" in output
+
+    live_board.close()
+    assert "\x1b[r" in console.file.getvalue()
+
+
+def test_live_board_keeps_text_when_nothing_changed():
+    console = make_console()
+    live_board = LiveBoard(console)
+    board = chess.Board()
+    live_board.show(board)
+    console.file.write("Invalid move, try again.\n")
+    console.file.seek(0)
+    console.file.truncate()
+
+    # No square changed: nothing is written, so the message is not cleared
+    assert live_board.show(board) == 0
+    assert console.file.getvalue() == ""
+
+
+def test_live_board_needs_room_for_the_frame_and_text():
+    board = chess.Board()
+    legacy = make_console()
+    legacy.legacy_windows = True
+    for console in (make_console(height=30), make_console(width=50), legacy):
+        live_board = LiveBoard(console)
+        live_board.show(board)
+        assert live_board.show(board) == 64
+        assert re.search(r"\x1b\[\d+;\d+r", console.file.getvalue()) is None
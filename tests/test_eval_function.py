@@ -0,0 +1,53 @@
+import chess
+from engine.eval_function import EvaluationFunction
+from engine.repetition import RepetitionTable
+
+FEN = "r1bq1rk1/pp1n1ppp/2pbpn2/3p4/3P4/2NBPN2/PP3PPP/R1BQ1RK1 w - - 0 1"
+
+
+def test_lazy_eval_inside_window_is_exact():
+    evaluator = EvaluationFunction()
+    board = chess.Board(FEN)
+    full = evaluator.evaluate_board(board)
+    assert evaluator.evaluate_board(board, alpha=full - 1, beta=full + 1) == full
+
+
+def test_lazy_eval_outside_window_skips_expensive_terms():
+    evaluator = EvaluationFunction()
+    board = chess.Board(FEN)
+    full = evaluator.evaluate_board(board)
+    cheap = full - evaluator._evaluate_king_safety(board) - evaluator._evaluate_pawn_structure(board)
+    far = cheap + evaluator._positional_bounds(board)[1] + 1
+    assert evaluator.evaluate_board(board, alpha=far, beta=far + 1) == cheap
+
+
+def test_eval_cache_hit_on_transposition():
+    evaluator = EvaluationFunction()
+    board = chess.Board(FEN)
+    for san in ["a3", "a6", "b3", "b6"]:
+        board.push_san(san)
+    repetitions = RepetitionTable(board)
+    full = evaluator.evaluate_board(board, repetitions)
+    assert evaluator.eval_cache[repetitions.key] == full
+
+    # Same position through a different move order is served from the cache
+    other = chess.Board(FEN)
+    for san in ["b3", "b6", "a3", "a6"]:
+        other.push_san(san)
+    assert evaluator.evaluate_board(other, RepetitionTable(other)) == full
+    assert len(evaluator.eval_cache) == 1
+
+
+def test_lazy_eval_is_exact_with_wide_pawn_swing():
+    # Four connected passers: the pawn terms alone are worth several hundred
+    board = chess.Board("4k3/8/PPPP4/8/8/8/8/4K3 w - - 0 1")
+    evaluator = EvaluationFunction()
+    full = evaluator.evaluate_board(board)
+    positional = evaluator._evaluate_king_safety(board) + evaluator._evaluate_pawn_structure(board)
+    cheap = full - positional
+    low, high = evaluator._positional_bounds(board)
+    assert positional > 300 and low <= positional <= high
+
+    # A window just above the cheap score must not exit early
+    for alpha in (cheap + 300, full - 1):
+        assert evaluator.evaluate_board(board, alpha=alpha, beta=alpha + 1) == full
@@ -0,0 +1,81 @@
+import chess
+from engine import algorithm
+from engine.algorithm import alphabeta, mate_in
+from engine.mate_search import mate_search, prove_mate
+
+
+def assert_mating_line(fen, line):
+    board = chess.Board(fen)
+    for move in line:
+        assert move in board.legal_moves
+        board.push(move)
+    assert board.is_checkmate()
+
+
+def test_mate_in_2_puzzles():
+    for fen in ["r4r1k/qp3pNp/p2P1B2/2p5/P7/8/1P1n2PP/4R1K1 w - - 1 0",
+                "r2qr1k1/pp3pb1/2n3p1/1N4n1/1P2p2Q/P3p3/1B1P1PP1/R3K2R w KQ - 1 0"]:
+        mate_moves, line, _ = mate_search(chess.Board(fen), 3)
+        assert mate_moves == 2
+        assert_mating_line(fen, line)
+
+
+def test_mate_in_3_puzzles():
+    for fen in ["2r1k3/ppp2RBp/1bn5/1N1N4/2B1p3/1P2P3/3q2PP/6K1 w - - 0 1",
+                "1r3rk1/pp1n4/1q2pp1Q/3p4/5P2/1P3R1P/P1P1p1P1/b6K w - - 2 25"]:
+        mate_moves, line, _ = mate_search(chess.Board(fen), 3)
+        assert mate_moves == 3
+        assert len(line) == 5
+        assert_mating_line(fen, line)
+
+
+def test_shortest_mate_is_returned():
+    fen = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1"
+    mate_moves, line, _ = mate_search(chess.Board(fen), 3)
+    assert mate_moves == 1
+    assert line == [chess.Move.from_uci("f3f7")]
+
+
+def test_no_mate_is_refuted():
+    result, line, _ = prove_mate(chess.Board(), 2, checks_only=False)
+    assert result is False
+    assert line is None
+
+
+def test_search_scores_mate_distance():
+    board = chess.Board("r4r1k/qp3pNp/p2P1B2/2p5/P7/8/1P1n2PP/4R1K1 w - - 1 0")
+    algorithm.NODE_COUNT = 0
+    score, move, _ = alphabeta(board, 3, -float("inf"), float("inf"), True)
+    assert mate_in(score) == 2
+    assert move == chess.Move.from_uci("g7f5")
+
+
+def test_quiescence_mate_is_distance_adjusted():
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1")
+    algorithm.HISTORY.reset(board)
+    algorithm.HISTORY.push(board, chess.Move.from_uci("f3f7"))
+    # Black to move and mated one ply from the root, scored for Black
+    assert algorithm.quiescence(board, -float("inf"), float("inf")) == -(algorithm.MATE_SCORE - 1)
+
+
+def test_capture_mate_inside_quiescence_keeps_its_sign():
+    # Kh1 lets ...Rxe1# through; the capture is only seen in quiescence
+    fen = "4r1k1/5ppp/8/8/8/8/5PPP/4B1K1 w - - 0 1"
+    board = chess.Board(fen)
+    board.push_san("Kh1")
+    algorithm.NODE_COUNT = 0
+    score, _, _ = alphabeta(board, 0, -float("inf"), float("inf"), False)
+    assert mate_in(score) == -1
+
+    algorithm.NODE_COUNT = 0
+    score, move, _ = alphabeta(chess.Board(fen), 1, -float("inf"), float("inf"), True)
+    assert mate_in(score) is None
+    assert move != chess.Move.from_uci("g1h1")
+
+
+def test_node_budget_fallback_still_scores_mate_distance():
+    board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1")
+    algorithm.NODE_COUNT = algorithm.MAX_NODES - 2
+    score, move, _ = alphabeta(board, 2, -float("inf"), float("inf"), True)
+    assert mate_in(score) == 1
+    assert move == chess.Move.from_uci("f3f7")
@@ -0,0 +1,65 @@
+import random
+import chess
+from engine.packed_positions import (POSITION_DTYPE, PositionFile, PositionWriter, convert,
+                                     decode_position, encode_position)
+from engine.perft import PERFT_POSITIONS
+
+PGN = """[Event "Test"]
+[Result "1-0"]
+
+1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6 4. Qxf7# 1-0
+"""
+
+
+def test_record_is_32_bytes():
+    assert POSITION_DTYPE.itemsize == 32
+
+
+def test_round_trip_preserves_fen():
+    rng = random.Random(0)
+    for fen, _ in PERFT_POSITIONS.values():
+        board = chess.Board(fen)
+        for _ in range(40):
+            assert decode_position(encode_position(board)).fen() == board.fen()
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+
+
+def test_memory_mapped_reader(tmp_path):
+    path = str(tmp_path / "positions.bin")
+    boards = [chess.Board(fen) for fen, _ in PERFT_POSITIONS.values()]
+    with PositionWriter(path) as writer:
+        for i, board in enumerate(boards):
+            writer.write(board, result=[1.0, 0.5, 0.0][i % 3], score=i * 10)
+
+    positions = PositionFile(path)
+    assert len(positions) == len(boards)
+    assert [b.fen() for b in positions.boards()] == [b.fen() for b in boards]
+    assert positions[1].fen() == boards[1].fen()
+    assert list(positions.records["score"]) == [i * 10 for i in range(len(boards))]
+    assert [result for _, result in positions.labelled()][:3] == [1.0, 0.5, 0.0]
+
+
+def test_convert_pgn(tmp_path):
+    source = tmp_path / "game.pgn"
+    source.write_text(PGN)
+    destination = str(tmp_path / "game.bin")
+    assert convert(str(source), destination) == 7
+
+    positions = PositionFile(destination)
+    assert positions[len(positions) - 1].is_checkmate()
+    assert all(result == 1.0 for _, result in positions.labelled())
+
+
+def test_empty_file(tmp_path):
+    source = tmp_path / "empty.epd"
+    source.write_text("")
+    destination = str(tmp_path / "empty.bin")
+    assert convert(str(source), destination) == 0
+
+    positions = PositionFile(destination)
+    assert len(positions) == 0
+    assert list(positions.boards()) == []
+    assert list(positions.labelled()) == []
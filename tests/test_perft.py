@@ -0,0 +1,31 @@
+import chess
+from engine.perft import PERFT_POSITIONS, divide, perft
+
+
+def test_perft_standard_positions():
+    for name, (fen, expected_counts) in PERFT_POSITIONS.items():
+        board = chess.Board(fen)
+        for depth in (1, 2):
+            nodes = perft(board, depth)
+            print(f"{name} depth {depth}: {nodes}")
+            assert nodes == expected_counts[depth - 1]
+
+
+def test_perft_hashed_matches_plain():
+    fen, expected_counts = PERFT_POSITIONS["position3"]
+    board = chess.Board(fen)
+    assert perft(board, 3, cache={}) == expected_counts[2]
+    assert board.fen() == fen
+
+
+def test_divide_sums_to_perft():
+    fen, expected_counts = PERFT_POSITIONS["kiwipete"]
+    counts = divide(chess.Board(fen), 2)
+    assert len(counts) == expected_counts[0]
+    assert sum(counts.values()) == expected_counts[1]
+
+
+def test_divide_process_pool():
+    fen, expected_counts = PERFT_POSITIONS["startpos"]
+    counts = divide(chess.Board(fen), 3, jobs=2)
+    assert sum(counts.values()) == expected_counts[2]
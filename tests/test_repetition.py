@@ -0,0 +1,62 @@
+import random
+import chess
+import chess.polyglot
+from engine import algorithm, zobrist
+from engine.algorithm import alphabeta
+from engine.perft import PERFT_POSITIONS
+from engine.repetition import RepetitionTable
+
+
+def test_incremental_key_matches_full_hash():
+    rng = random.Random(0)
+    for fen, _ in PERFT_POSITIONS.values():
+        board = chess.Board(fen)
+        key = zobrist.zobrist_key(board)
+        for _ in range(60):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            key = zobrist.push(board, rng.choice(moves), key)
+            assert key == chess.polyglot.zobrist_hash(board)
+
+
+def test_repetition_matches_python_chess():
+    board = chess.Board()
+    for san in ["e4", "e5", "Nf3", "Nc6"]:
+        board.push_san(san)
+
+    table = RepetitionTable(board)
+    for san in ["Ng1", "Nb8", "Nf3", "Nc6", "Ng1", "Nb8", "Nf3", "Nc6"]:
+        table.push(board, board.parse_san(san))
+        assert table.is_repetition(board) == board.is_repetition(3)
+
+    assert table.is_draw(board)
+    for _ in range(4):
+        table.pop(board)
+        assert table.is_repetition(board) == board.is_repetition(3)
+
+
+def test_fifty_move_rule_is_draw():
+    board = chess.Board("8/8/4k3/8/8/3K4/8/7R w - - 100 80")
+    assert RepetitionTable(board).is_draw(board)
+
+
+def test_root_repetition_still_recommends_a_move():
+    board = chess.Board()
+    for san in ["Nf3", "Nf6", "Ng1", "Ng8"] * 2:
+        board.push_san(san)
+    algorithm.NODE_COUNT = 0
+    score, move, _ = alphabeta(board, 2, -float("inf"), float("inf"), True)
+    assert move is not None
+
+
+def test_search_scores_child_repetition_as_draw():
+    # White is a queen down; returning the knight to g1 repeats the start
+    # position for the third time, so the search should take the draw
+    board = chess.Board("kn6/8/q7/8/8/8/8/6NK b - - 0 1")
+    for san in ["Nc6", "Nf3", "Nb8", "Ng1", "Nc6", "Nf3", "Nb8"]:
+        board.push_san(san)
+    algorithm.NODE_COUNT = 0
+    score, move, _ = alphabeta(board, 1, -float("inf"), float("inf"), True)
+    assert move == chess.Move.from_uci("f3g1")
+    assert score == 0
@@ -1,7 +1,8 @@
 import time
 import chess
 from stockfish import Stockfish
-from engine.algorithm import alphabeta
+from engine.algorithm import alphabeta, mate_in
+from engine.mate_search import mate_search
 from engine.eval_function import EvaluationFunction
 
 STOCKFISH_PATH = "stockfish/stockfish.exe"
@@ -25,6 +26,8 @@ def run_ai_vs_stockfish(board: chess.Board, depth: int):
     ai_time = time.time() - start_time
 
     print(f"Custom AI recommends: {move}, Score: {score}")
+    if mate_in(score) is not None:
+        print(f"Mate in {abs(mate_in(score))} found by search")
     print(f"Search latency: {ai_time:.2f}s")
 
     # Nodes/sec
@@ -58,6 +61,19 @@ def run_ai_vs_stockfish(board: chess.Board, depth: int):
     print()
 
 
+def run_mate_search(board: chess.Board, max_moves: int):
+    start_time = time.time()
+    mate_moves, line, metrics = mate_search(board, max_moves)
+    mate_time = time.time() - start_time
+
+    if line is None:
+        print(f"Mate solver: no mate in {max_moves} proven")
+    else:
+        print(f"Mate solver: mate in {mate_moves}: {board.variation_san(line)}")
+    print(f"Mate solver nodes: {metrics['nodes_visited']}, latency: {mate_time:.2f}s")
+    return mate_moves, line
+
+
 # --- Original Tests ---
 def test_checkmate_in_1():
     print("=== Checkmate in 1 Test ===")
@@ -68,26 +84,31 @@ def test_checkmate_in_2():
     print("=== Checkmate in 2 Test ===")
     board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1")
     run_ai_vs_stockfish(board, depth=4)
+    run_mate_search(board, max_moves=2)
 
 def test_mate_in_2_1():
     print("=== Mate in 2 Puzzle 1 ===")
     board = chess.Board("r4r1k/qp3pNp/p2P1B2/2p5/P7/8/1P1n2PP/4R1K1 w - - 1 0")
     run_ai_vs_stockfish(board, depth=4)
+    run_mate_search(board, max_moves=2)
 
 def test_mate_in_2_2():
     print("=== Mate in 2 Puzzle 2 ===")
     board = chess.Board("r2qr1k1/pp3pb1/2n3p1/1N4n1/1P2p2Q/P3p3/1B1P1PP1/R3K2R w KQ - 1 0")
     run_ai_vs_stockfish(board, depth=4)
+    run_mate_search(board, max_moves=2)
 
 def test_mate_in_3_1():
     print("=== Mate in 3 Puzzle 1 ===")
     board = chess.Board("2r1k3/ppp2RBp/1bn5/1N1N4/2B1p3/1P2P3/3q2PP/6K1 w - - 0 1")
     run_ai_vs_stockfish(board, depth=6)
+    run_mate_search(board, max_moves=3)
 
 def test_mate_in_3_2():
     print("=== Mate in 3 Puzzle 2 ===")
     board = chess.Board("1r3rk1/pp1n4/1q2pp1Q/3p4/5P2/1P3R1P/P1P1p1P1/b6K w - - 2 25")
     run_ai_vs_stockfish(board, depth=6)
+    run_mate_search(board, max_moves=3)
 
 def test_knight_fork():
     print("=== Knight Fork Tactic Test ===")
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import time
+from cli import recommender
+from engine import algorithm
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loose sanity bound only; STARTUP_TARGET is checked on run_recommender below
+IMPORT_TIME_LIMIT = 10.0
+
+IMPORT_CHECK = """
+import sys, time
+start = time.perf_counter()
+import cli.recommender
+print(time.perf_counter() - start)
+print("stockfish" in sys.modules, "numpy" in sys.modules)
+"""
+
+
+def test_cli_import_defers_heavy_modules():
+    output = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True).stdout.split("\n")
+    import_time = float(output[0])
+    print(f"cli.recommender import: {import_time:.3f}s")
+    assert output[1] == "False False"
+    assert import_time < IMPORT_TIME_LIMIT
+
+
+class StubStockfish:
+    """ Stands in for BackgroundStockfish: answers at once, no engine process """
+
+    def __init__(self, path, **kwargs):
+        self.error = None
+
+    def recommend(self, fen):
+        pass
+
+    def best_move(self):
+        return "e2e4"
+
+
+def test_first_prompt_within_startup_target(monkeypatch):
+    prompts = []
+
+    def quit_at_prompt(prompt):
+        prompts.append(time.perf_counter())
+        return "quit"
+
+    monkeypatch.setattr(recommender, "BackgroundStockfish", StubStockfish)
+    monkeypatch.setattr("builtins.input", quit_at_prompt)
+    algorithm.TRANSPOSITION_TABLE.clear()
+    algorithm.NODE_COUNT = 0
+
+    launch_time = time.perf_counter()
+    recommender.run_recommender(launch_time)
+    startup_time = prompts[0] - launch_time
+    print(f"time to first prompt: {startup_time:.3f}s")
+    assert startup_time < recommender.STARTUP_TARGET
@@ -0,0 +1,62 @@
+import random
+import chess
+import numpy as np
+from engine.eval_function import EvaluationFunction
+from engine.texel_tuner import (build_feature_set, evaluate_feature_set, loss_and_gradient,
+                                save_weights, tune, weights_from_evaluator)
+
+
+def random_positions(count, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(4, 60)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        positions.append((board, rng.choice([0.0, 0.5, 1.0])))
+    return positions
+
+
+def test_features_reproduce_evaluate_board():
+    evaluator = EvaluationFunction()
+    positions = [(board, result) for board, result in random_positions(50)
+                 if board.legal_moves.count() and not board.is_insufficient_material()]
+    features = build_feature_set(positions, evaluator)
+    scores = evaluate_feature_set(features, weights_from_evaluator(evaluator), chunk_size=16)
+
+    for (board, _), score in zip(positions, scores):
+        board.clear_stack()  # evaluate_board must not see repetitions from the playout
+        assert score == evaluator.evaluate_board(board)
+
+
+def test_rule_draws_are_skipped():
+    fifty_moves = chess.Board("4k3/8/8/8/8/8/4P3/R3K3 w - - 100 80")
+    playable = chess.Board("4k3/8/8/8/8/8/4P3/R3K3 w - - 99 80")
+    features = build_feature_set([(fifty_moves, 0.5), (playable, 1.0)])
+    assert len(features) == 1
+    assert features.results[0] == 1.0
+
+
+def test_tuning_lowers_loss():
+    features = build_feature_set(random_positions(200, seed=1))
+    weights = weights_from_evaluator(EvaluationFunction())
+    loss_before, _ = loss_and_gradient(features, weights, 1.0)
+    tuned = tune(features, weights, epochs=20, learning_rate=2.0, verbose=False)
+    loss_after, _ = loss_and_gradient(features, tuned, 1.0)
+    assert loss_after < loss_before
+
+
+def test_saved_weights_load_into_evaluator(tmp_path):
+    weights = weights_from_evaluator(EvaluationFunction())
+    weights[0] = 123
+    weights[-2] = 7
+    path = tmp_path / "weights.json"
+    save_weights(path, weights)
+
+    evaluator = EvaluationFunction(path)
+    assert evaluator.piece_values[chess.PAWN] == 123
+    assert evaluator.mobility_weight == 7
+    assert np.array_equal(weights_from_evaluator(evaluator), np.round(weights))